@@ -116,7 +116,7 @@ def _make_progress_cb() -> "Optional[ProgressCallback]":
     return _plain_cb
 
 
-def _load_code_from_cli_path(path: str, no_constants: bool) -> Bytecode:
+def _load_code_from_cli_path(path: str, no_constants: bool, track_sections: Optional[bool] = None) -> Bytecode:
     is_haxe = True
     with open(path, "rb") as f:
         if f.read(3) == b"HLB":
@@ -132,10 +132,14 @@ def _load_code_from_cli_path(path: str, no_constants: bool) -> Bytecode:
         stripped = path.split(".")[0]
         subprocess.run(["haxe", "-hl", f"{stripped}.hl", "-main", path])
         with open(f"{stripped}.hl", "rb") as f:
-            return Bytecode().deserialise(f, init_globals=not no_constants, progress_cb=_make_progress_cb())
+            return Bytecode().deserialise(
+                f, init_globals=not no_constants, progress_cb=_make_progress_cb(), track_sections=track_sections
+            )
 
     with open(path, "rb") as f:
-        return Bytecode().deserialise(f, init_globals=not no_constants, progress_cb=_make_progress_cb())
+        return Bytecode().deserialise(
+            f, init_globals=not no_constants, progress_cb=_make_progress_cb(), track_sections=track_sections
+        )
 
 
 def _default_hlc_output(path: str) -> str:
@@ -497,14 +501,13 @@ def disasm_main(argv: List[str]) -> None:
     parser.add_argument("-N", "--no-constants", action="store_true", help="Skip constant resolution")
     args = parser.parse_args(argv)
     code = _load_code_from_cli_path(args.file, args.no_constants)
-    for func in code.functions:
-        if func.findex.value == args.findex:
-            print(disasm.func(code, func))
-            return
-    for native in code.natives:
-        if native.findex.value == args.findex:
-            print(disasm.native_header(code, native))
-            return
+    target = code.get_findex_map().get(args.findex)
+    if isinstance(target, Function):
+        print(disasm.func(code, target))
+        return
+    if isinstance(target, Native):
+        print(disasm.native_header(code, target))
+        return
     print(f"Function f@{args.findex} not found.", file=sys.stderr)
     sys.exit(1)
 
@@ -746,11 +749,11 @@ def decompile_main(argv: List[str]) -> None:
         from .decomp import IRFunction
         from .pseudo import pseudo as _pseudo
 
-        for func in code.functions:
-            if func.findex.value == args.index:
-                ir = IRFunction(code, func)
-                print(_pseudo(ir))
-                return
+        func = code.get_findex_map().get(args.index)
+        if isinstance(func, Function):
+            ir = IRFunction(code, func)
+            print(_pseudo(ir))
+            return
         print(f"Function f@{args.index} not found.", file=sys.stderr)
         sys.exit(1)
 
@@ -1241,15 +1244,13 @@ class Commands(BaseCommands):
         except ValueError:
             print("Invalid index.")
             return
-        for func in self.code.functions:
-            if func.findex.value == index:
-                print(disasm.func(self.code, func))
-                return
-        for native in self.code.natives:
-            if native.findex.value == index:
-                print(disasm.native_header(self.code, native))
-                return
-        print("Function not found.")
+        func = self.code.get_findex_map().get(index)
+        if isinstance(func, Native):
+            print(disasm.native_header(self.code, func))
+        elif isinstance(func, Function):
+            print(disasm.func(self.code, func))
+        else:
+            print("Function not found.")
 
     def cfg(self, args: List[str]) -> None:
         """Renders a control flow graph for a given findex and attempts to open it in the default image viewer. `cfg <idx>`"""
@@ -1261,41 +1262,41 @@ class Commands(BaseCommands):
         except ValueError:
             print("Invalid index.")
             return
-        for func in self.code.functions:
-            if func.findex.value == index:
-                cfg = decomp.CFGraph(func)
-                print("Building control flow graph...")
-                cfg.build()
-                print("DOT:")
-                dot = cfg.graph(self.code)
-                print(dot)
-                print("Attempting to render graph...")
-                with tempfile.NamedTemporaryFile(suffix=".dot", delete=False) as f:
-                    f.write(dot.encode())
-                    dot_file = f.name
-
-                png_file = dot_file.replace(".dot", ".png")
-                try:
-                    subprocess.run(
-                        ["dot", "-Tpng", dot_file, "-o", png_file, "-Gdpi=300"],
-                        check=True,
-                    )
-                except FileNotFoundError:
-                    print("Graphviz not found. Install Graphviz to generate PNGs.")
-                    return
+        func = self.code.get_findex_map().get(index)
+        if not isinstance(func, Function):
+            print("Function not found.")
+            return
+        cfg = decomp.CFGraph(func)
+        print("Building control flow graph...")
+        cfg.build()
+        print("DOT:")
+        dot = cfg.graph(self.code)
+        print(dot)
+        print("Attempting to render graph...")
+        with tempfile.NamedTemporaryFile(suffix=".dot", delete=False) as f:
+            f.write(dot.encode())
+            dot_file = f.name
+
+        png_file = dot_file.replace(".dot", ".png")
+        try:
+            subprocess.run(
+                ["dot", "-Tpng", dot_file, "-o", png_file, "-Gdpi=300"],
+                check=True,
+            )
+        except FileNotFoundError:
+            print("Graphviz not found. Install Graphviz to generate PNGs.")
+            return
 
-                try:
-                    if platform.system() == "Windows":
-                        subprocess.run(["start", png_file], shell=True)
-                    elif platform.system() == "Darwin":
-                        subprocess.run(["open", png_file])
-                    else:
-                        subprocess.run(["xdg-open", png_file])
-                    os.unlink(dot_file)
-                except:
-                    print(f"Control flow graph saved to {png_file}. Use your favourite image viewer to open it.")
-                return
-        print("Function not found.")
+        try:
+            if platform.system() == "Windows":
+                subprocess.run(["start", png_file], shell=True)
+            elif platform.system() == "Darwin":
+                subprocess.run(["open", png_file])
+            else:
+                subprocess.run(["xdg-open", png_file])
+            os.unlink(dot_file)
+        except:
+            print(f"Control flow graph saved to {png_file}. Use your favourite image viewer to open it.")
 
     def ir(self, args: List[str]) -> None:
         """Prints the IR of a function in object-notation. `ir <idx>`"""
@@ -1306,12 +1307,12 @@ class Commands(BaseCommands):
         except ValueError:
             print("Invalid index.")
             return
-        for func in self.code.functions:
-            if func.findex.value == index:
-                ir = decomp.IRFunction(self.code, func)
-                ir.print()
-                return
-        print("Function not found.")
+        func = self.code.get_findex_map().get(index)
+        if not isinstance(func, Function):
+            print("Function not found.")
+            return
+        ir = decomp.IRFunction(self.code, func)
+        ir.print()
 
     @alias("decompile", "dec", "pseudo", "d")
     def decomp(self, args: List[str]) -> None:
@@ -1323,13 +1324,13 @@ class Commands(BaseCommands):
         except ValueError:
             print("Invalid index.")
             return
-        for func in self.code.functions:
-            if func.findex.value == index:
-                ir = decomp.IRFunction(self.code, func)
-                print("\n")
-                _emit_haxe(pseudo(ir))
-                return
-        print("Function not found.")
+        func = self.code.get_findex_map().get(index)
+        if not isinstance(func, Function):
+            print("Function not found.")
+            return
+        ir = decomp.IRFunction(self.code, func)
+        print("\n")
+        _emit_haxe(pseudo(ir))
 
     @alias("df")
     def decompfile(self, args: List[str]) -> None:
@@ -2357,6 +2358,8 @@ class Commands(BaseCommands):
             print("Invalid offset.")
             return
         print(self.code.section_at(offset))
+        if not self.code.tracked_sections:
+            print("(coarse result - only top-level sections were tracked when this bytecode was loaded)")
 
     def floats(self, args: List[str]) -> None:
         """List all floats in the bytecode."""
@@ -2912,7 +2915,8 @@ def main() -> None:
             )
             return
     else:
-        code = _load_code_from_cli_path(args.file, args.no_constants)
+        # the REPL's `offset` command names individual functions/types, so record every element's offset
+        code = _load_code_from_cli_path(args.file, args.no_constants, track_sections=None if args.patch else True)
 
     if args.patch:
         print(f"Loading patch: {args.patch}")
@@ -2934,7 +2938,7 @@ def main() -> None:
             if not args.output:
                 args.output = args.file + ".patch"
             with open(args.output, "wb") as f:
-                f.write(code.serialise())
+                code.serialise_to(f)
             with open(
                 os.path.join(os.path.dirname(args.output), "crashlink_patch.py"),
                 "w",
@@ -9,15 +9,17 @@ you.
 
 from __future__ import annotations
 
-import ctypes
 import hashlib
+import os
 import struct
+import sys
+from bisect import bisect_right
 from abc import ABC, abstractmethod
 from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime
 from enum import Enum as _Enum
 import threading
+import time
 
 _EnumBase = _Enum
 from io import BytesIO
@@ -27,12 +29,14 @@ from typing import (
     Callable,
     Dict,
     ItemsView,
+    Iterator,
     List,
     Literal,
     Optional,
     Set,
     Tuple,
     TypeVar,
+    cast,
 )
 
 T = TypeVar("T", bound="VarInt")  # easier than reimplementing deserialise for each subclass
@@ -82,6 +86,20 @@ def is_static_name(s: str) -> bool:
     return s.rpartition(".")[-1].startswith("$")
 
 
+def _buffer_of(f: BinaryIO | BytesIO) -> Tuple[bytes, int]:
+    """
+    Returns a bytes buffer backing `f` and the current read position within it, without moving `f`. For a BytesIO this
+    is zero-copy; other streams have their remaining contents read and are seeked back. Once done decoding from the
+    buffer, advance `f` with `f.seek(new_pos - pos, 1)`.
+    """
+    if isinstance(f, BytesIO):
+        return f.getvalue(), f.tell()
+    start = f.tell()
+    data = f.read()
+    f.seek(start)
+    return data, 0
+
+
 class Serialisable(ABC):
     """
     Base class for all serialisable objects.
@@ -100,6 +118,13 @@ class Serialisable(ABC):
     def serialise(self) -> bytes:
         pass
 
+    def serialise_into(self, buf: bytearray) -> None:
+        """
+        Appends the serialised form of this object to `buf`. Containers override this to write their children straight
+        into the shared buffer instead of joining intermediate bytes objects.
+        """
+        buf += self.serialise()
+
     def __str__(self) -> str:
         try:
             return str(self.value)
@@ -180,13 +205,7 @@ class SerialisableInt(Serialisable):
         self.length = length
         self.byteorder = byteorder
         self.signed = signed
-        bytes_read = f.read(length)
-        if all(b == 0 for b in bytes_read):
-            self.value = 0
-            return self
-        while len(bytes_read) > 1 and bytes_read[-1] == 0:
-            bytes_read = bytes_read[:-1]
-        self.value = int.from_bytes(bytes_read, byteorder, signed=signed)
+        self.value = int.from_bytes(f.read(length), byteorder, signed=signed)
         return self
 
     def serialise(self) -> bytes:
@@ -204,15 +223,17 @@ class SerialisableF64(Serialisable):
         self.value = 0.0
 
     def deserialise(self, f: BinaryIO | BytesIO) -> "SerialisableF64":
-        self.value = struct.unpack("<d", f.read(8))[0]
+        self.value = _struct_f64.unpack(f.read(8))[0]
         return self
 
     def serialise(self) -> bytes:
-        return struct.pack("<d", self.value)
+        return _struct_f64.pack(self.value)
 
 
-_struct_short = struct.Struct(">H")  # big-endian unsigned short
 _struct_medium = struct.Struct(">I")  # big-endian unsigned int (for 3 bytes)
+_struct_header = struct.Struct("<3sB")  # bytecode magic + version byte
+_struct_f64 = struct.Struct("<d")  # little-endian double
+_SIZE_T_MASK = 0xFFFFFFFFFFFFFFFF  # DebugInfo's current line is a size_t in HL's writer, so negative lines wrap
 
 
 class VarInt(Serialisable):
@@ -231,16 +252,14 @@ class VarInt(Serialisable):
             self.value = b
             return self
         if b < 0xC0:
-            second = f.read(1)[0]
-            val = ((b & 0x1F) << 8) | second
-            self.value = (val ^ -((b >> 5) & 1)) + ((b >> 5) & 1)
-            return self
-        remaining_bytes = f.read(3)
-        if len(remaining_bytes) < 3:
-            raise ValueError("Incomplete VarInt at end of stream")
-        remaining = int.from_bytes(remaining_bytes, "big")
-        val = ((b & 0x1F) << 24) | remaining
-        self.value = (val ^ -((b >> 5) & 1)) + ((b >> 5) & 1)
+            val = ((b & 0x1F) << 8) | f.read(1)[0]
+        else:
+            # the low 5 bits of the first byte, then the other three as one big-endian word (no seek back needed)
+            rest = f.read(3)
+            if len(rest) < 3:
+                raise ValueError("Incomplete VarInt at end of stream")
+            val = ((b & 0x1F) << 24) | _struct_medium.unpack(b"\x00" + rest)[0]
+        self.value = -val if b & 0x20 else val
         return self
 
     def serialise(self) -> bytes:
@@ -276,6 +295,76 @@ class VarInt(Serialisable):
             ]
         )
 
+    def serialise_into(self, buf: bytearray) -> None:
+        if 0 <= self.value < 0x80:
+            buf.append(self.value)
+        else:
+            buf += self.serialise()
+
+
+def _read_varint(buf: bytes | bytearray, pos: int) -> Tuple[int, int]:
+    """
+    Decodes a VarInt straight from `buf` at `pos`, returning its value and the position just past it.
+    """
+    b = buf[pos]
+    if b < 0x80:
+        return b, pos + 1
+    if b < 0xC0:
+        val = ((b & 0x1F) << 8) | buf[pos + 1]
+        return (-val if b & 0x20 else val), pos + 2
+    val = ((b & 0x1F) << 24) | (buf[pos + 1] << 16) | (buf[pos + 2] << 8) | buf[pos + 3]
+    return (-val if b & 0x20 else val), pos + 4
+
+
+def _read_varint_run(f: BinaryIO | BytesIO, n: int) -> List[int]:
+    """
+    Reads `n` consecutive VarInts from `f` and returns their values. Every VarInt is at least one byte, so the first `n`
+    bytes are read in one go (the whole run, when all of them are single-byte); longer runs only read the extra bytes
+    they need, never past the end of the run, so `f` doesn't have to be seekable.
+    """
+    block = f.read(n)
+    if len(block) == n and block.isascii():  # all single-byte VarInts
+        return list(block)
+    buf = bytearray(block)
+    values: List[int] = []
+    pos = 0
+    for left in range(n - 1, -1, -1):
+        if pos >= len(buf):
+            raise ValueError("Incomplete VarInt at end of stream")
+        b = buf[pos]
+        # this VarInt's length, plus at least one byte for each VarInt after it
+        missing = pos + (1 if b < 0x80 else 2 if b < 0xC0 else 4) + left - len(buf)
+        if missing > 0:
+            more = f.read(missing)
+            if len(more) < missing:
+                raise ValueError("Incomplete VarInt at end of stream")
+            buf += more
+        value, pos = _read_varint(buf, pos)
+        values.append(value)
+    return values
+
+
+def _unpack_pool(f: BinaryIO | BytesIO, fmt: str, size: int, count: int) -> Tuple[Any, ...]:
+    """
+    Reads `count` little-endian values of struct format `fmt` (each `size` bytes wide) from `f` in one go.
+    """
+    data = f.read(size * count)
+    if len(data) != size * count:
+        raise MalformedBytecode(f"Expected {count} values of {size} bytes, got {len(data)} bytes")
+    return struct.unpack(f"<{count}{fmt}", data)
+
+
+def _pack_ints(ints: List[SerialisableInt]) -> bytes:
+    """
+    Encodes the int pool in one pack when every entry has the default layout (4-byte little-endian unsigned).
+    """
+    if all(i.length == 4 and i.byteorder == "little" and not i.signed for i in ints):
+        try:
+            return struct.pack(f"<{len(ints)}I", *[i.value for i in ints])
+        except struct.error:
+            pass  # out of range - let the per-int path raise its usual OverflowError
+    return b"".join([i.serialise() for i in ints])
+
 
 class ResolvableVarInt(VarInt, ABC):
     """
@@ -394,14 +483,14 @@ class fieldRef(ResolvableVarInt):
 
     def resolve(self, code: "Bytecode") -> "Field":
         if self.obj:
-            return self.obj.resolve_fields(code)[self.value]
+            return self.obj._all_fields(code)[self.value]
         raise ValueError(
             "Cannot resolve field without context. Try setting `field.obj` to an instance of `Obj`, or use `field.resolve_obj(code, obj)` instead."
         )
 
     def resolve_obj(self, code: "Bytecode", obj: "Obj|Virtual") -> "Field":
         self.obj = obj
-        return obj.resolve_fields(code)[self.value]
+        return obj._all_fields(code)[self.value]
 
 
 class Reg(ResolvableVarInt):
@@ -449,13 +538,19 @@ class VarInts(Serialisable):
 
     def deserialise(self, f: BinaryIO | BytesIO) -> "VarInts":
         self.n.deserialise(f)
-        for _ in range(self.n.value):
-            self.value.append(VarInt().deserialise(f))
+        self.value = [VarInt(v) for v in _read_varint_run(f, self.n.value)]
         return self
 
     def serialise(self) -> bytes:
+        buf = bytearray()
+        self.serialise_into(buf)
+        return bytes(buf)
+
+    def serialise_into(self, buf: bytearray) -> None:
         self.n.value = len(self.value)
-        return b"".join([self.n.serialise(), b"".join([value.serialise() for value in self.value])])
+        self.n.serialise_into(buf)
+        for value in self.value:
+            value.serialise_into(buf)
 
 
 class Regs(Serialisable):
@@ -471,13 +566,19 @@ class Regs(Serialisable):
 
     def deserialise(self, f: BinaryIO | BytesIO) -> "Regs":
         self.n.deserialise(f)
-        for _ in range(self.n.value):
-            self.value.append(Reg().deserialise(f))
+        self.value = [Reg(v) for v in _read_varint_run(f, self.n.value)]
         return self
 
     def serialise(self) -> bytes:
+        buf = bytearray()
+        self.serialise_into(buf)
+        return bytes(buf)
+
+    def serialise_into(self, buf: bytearray) -> None:
         self.n.value = len(self.value)
-        return b"".join([self.n.serialise(), b"".join([value.serialise() for value in self.value])])
+        self.n.serialise_into(buf)
+        for value in self.value:
+            value.serialise_into(buf)
 
 
 class StringsBlock(Serialisable):
@@ -485,56 +586,75 @@ class StringsBlock(Serialisable):
     Block of strings in the bytecode. Contains a list of strings and their lengths.
     """
 
-    __slots__ = ("length", "value", "lengths")
+    __slots__ = ("length", "value", "lengths", "_raw")
 
     def __init__(self) -> None:
         self.length = SerialisableInt()
         self.length.length = 4
         self.value: List[str] = []
-        self.lengths: List[VarInt] = []
+        self.lengths: List[int] = []
+        self._raw: Optional[Tuple[List[str], bytes, bytes]] = None
+        """Snapshot of `value` as deserialised, with the string data and length bytes it was read from."""
 
     def deserialise(self, f: BinaryIO | BytesIO, nstrings: int) -> "StringsBlock":
         self.length.deserialise(f, length=4)
         size = self.length.value
         sdata: bytes = f.read(size)
+        buf, start = _buffer_of(f)
+        pos = start
+        lengths: List[int] = []
+        for _ in range(nstrings):
+            sz, pos = _read_varint(buf, pos)
+            lengths.append(sz)
+        f.seek(pos - start, 1)
+        lengths_data = buf[start:pos]
+
+        # Fast path: split on the terminators in one C-level scan, which holds as long as no string embeds a NUL.
+        parts = sdata.split(b"\x00")
+        if len(parts) == nstrings + 1 and not parts[-1] and all(len(part) == sz for part, sz in zip(parts, lengths)):
+            del parts[-1]
+            self.value = [part.decode("utf-8", errors="surrogateescape") for part in parts]
+            self.lengths = lengths
+            self._raw = (list(self.value), sdata, lengths_data)
+            return self
+
         strings: List[str] = []
-        lengths: List[VarInt] = []
         curpos = 0
-
-        for _ in range(nstrings):
-            sz = VarInt().deserialise(f)
+        for sz in lengths:
             # Check if we can read string + null terminator
-            if curpos + sz.value + 1 > size:
+            if curpos + sz + 1 > size:
                 raise ValueError("Invalid string")
 
             # Verify null terminator
-            if sdata[curpos + sz.value] != 0:
+            if sdata[curpos + sz] != 0:
                 raise ValueError("Invalid string")
 
-            str_value = sdata[curpos : curpos + sz.value]
+            str_value = sdata[curpos : curpos + sz]
             strings.append(str_value.decode("utf-8", errors="surrogateescape"))
-            lengths.append(sz)
 
-            curpos += sz.value + 1  # Move past string and null terminator
+            curpos += sz + 1  # Move past string and null terminator
 
         self.value = strings
         self.lengths = lengths
+        self._raw = (list(self.value), sdata, lengths_data)
         return self
 
     def serialise(self) -> bytes:
-        strings_data = bytearray()
-        for string in self.value:
-            encoded = string.encode("utf-8", errors="surrogateescape")
-            strings_data.extend(encoded)
-            strings_data.append(0)  # null terminator
+        if self._raw is not None and self._raw[0] == self.value:
+            # untouched since it was read (the list compare is mostly identity checks), so write back the original bytes
+            _, strings_data, lengths_data = self._raw
+            self.length.value = len(strings_data)
+            return self.length.serialise() + strings_data + lengths_data
+        encoded = [string.encode("utf-8", errors="surrogateescape") for string in self.value]
+        self.lengths = [len(data) for data in encoded]
+        strings_data = b"\x00".join(encoded) + b"\x00" if encoded else b""  # every string is NUL-terminated
 
         self.length.value = len(strings_data)
-        self.lengths = [VarInt(len(string.encode("utf-8", errors="surrogateescape"))) for string in self.value]
 
         result = bytearray(self.length.serialise())
         result.extend(strings_data)
         for length in self.lengths:
-            result.extend(length.serialise())
+            VarInt(length).serialise_into(result)
 
         return bytes(result)
 
@@ -566,16 +686,17 @@ class BytesBlock(Serialisable):
         self.nbytes = nbytes
         self.size.deserialise(f, length=4)
         raw = f.read(self.size.value)
-        positions: List[VarInt] = []
+        # the positions are only needed as plain ints, so decode them straight from the buffer
+        buf, start = _buffer_of(f)
+        pos = start
+        positions_int: List[int] = []
         for _ in range(nbytes):
-            pos = VarInt()
-            pos.deserialise(f)
-            positions.append(pos)
-        positions_int = [pos.value for pos in positions]
-        for i in range(len(positions_int)):
-            start = positions_int[i]
-            end = positions_int[i + 1] if i + 1 < len(positions_int) else len(raw)
-            self.value.append(raw[start:end])  # Append the extracted byte string
+            value, pos = _read_varint(buf, pos)
+            positions_int.append(value)
+        f.seek(pos - start, 1)
+        ends = positions_int[1:]
+        ends.append(len(raw))
+        self.value = [raw[start:end] for start, end in zip(positions_int, ends)]
         return self
 
     def serialise(self) -> bytes:
@@ -615,6 +736,9 @@ class _NoDataType(TypeDef):
     def serialise(self) -> bytes:
         return b""
 
+    def serialise_into(self, buf: bytearray) -> None:
+        pass
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, _NoDataType):
             return NotImplemented
@@ -716,20 +840,21 @@ class Fun(TypeDef):
 
     def deserialise(self, f: BinaryIO | BytesIO) -> "Fun":
         self.nargs.deserialise(f)
-        for _ in range(self.nargs.value):
-            self.args.append(tIndex().deserialise(f))
+        self.args = [tIndex().deserialise(f) for _ in range(self.nargs.value)]
         self.ret.deserialise(f)
         return self
 
     def serialise(self) -> bytes:
+        buf = bytearray()
+        self.serialise_into(buf)
+        return bytes(buf)
+
+    def serialise_into(self, buf: bytearray) -> None:
         self.nargs.value = len(self.args)
-        return b"".join(
-            [
-                self.nargs.serialise(),
-                b"".join([idx.serialise() for idx in self.args]),
-                self.ret.serialise(),
-            ]
-        )
+        self.nargs.serialise_into(buf)
+        for idx in self.args:
+            idx.serialise_into(buf)
+        self.ret.serialise_into(buf)
 
     def str_resolve(self, code: "Bytecode") -> str:
         """
@@ -769,6 +894,10 @@ class Field(Serialisable):
     def serialise(self) -> bytes:
         return b"".join([self.name.serialise(), self.type.serialise()])
 
+    def serialise_into(self, buf: bytearray) -> None:
+        self.name.serialise_into(buf)
+        self.type.serialise_into(buf)
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Field):
             return NotImplemented
@@ -798,6 +927,11 @@ class Proto(Serialisable):
     def serialise(self) -> bytes:
         return b"".join([self.name.serialise(), self.findex.serialise(), self.pindex.serialise()])
 
+    def serialise_into(self, buf: bytearray) -> None:
+        self.name.serialise_into(buf)
+        self.findex.serialise_into(buf)
+        self.pindex.serialise_into(buf)
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Proto):
             return NotImplemented
@@ -825,6 +959,10 @@ class Binding(Serialisable):
     def serialise(self) -> bytes:
         return b"".join([self.field.serialise(), self.findex.serialise()])
 
+    def serialise_into(self, buf: bytearray) -> None:
+        self.field.serialise_into(buf)
+        self.findex.serialise_into(buf)
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Binding):
             return NotImplemented
@@ -854,6 +992,7 @@ class Obj(TypeDef):
         "_is_static",
         "_static",
         "_dynamic",
+        "_resolved_fields",
     )
 
     def __init__(self) -> None:
@@ -882,6 +1021,7 @@ class Obj(TypeDef):
         self._is_static: Optional[bool] = None
         self._static: "Optional[Obj]" = None
         self._dynamic: "Optional[Obj]" = None
+        self._resolved_fields: Optional[Tuple[object, List[Field]]] = None
 
     def get_containing_type(self, code: Bytecode) -> Type:
         """Finds the Type object that contains this Obj definition."""
@@ -942,31 +1082,32 @@ class Obj(TypeDef):
         self.nfields.deserialise(f)
         self.nprotos.deserialise(f)
         self.nbindings.deserialise(f)
-        for _ in range(self.nfields.value):
-            self.fields.append(Field().deserialise(f))
-        for _ in range(self.nprotos.value):
-            self.protos.append(Proto().deserialise(f))
-        for _ in range(self.nbindings.value):
-            self.bindings.append(Binding().deserialise(f))
+        self.fields = [Field().deserialise(f) for _ in range(self.nfields.value)]
+        self.protos = [Proto().deserialise(f) for _ in range(self.nprotos.value)]
+        self.bindings = [Binding().deserialise(f) for _ in range(self.nbindings.value)]
         return self
 
     def serialise(self) -> bytes:
+        buf = bytearray()
+        self.serialise_into(buf)
+        return bytes(buf)
+
+    def serialise_into(self, buf: bytearray) -> None:
         self.nfields.value = len(self.fields)
         self.nprotos.value = len(self.protos)
         self.nbindings.value = len(self.bindings)
-        return b"".join(
-            [
-                self.name.serialise(),
-                self.super.serialise(),
-                self._global.serialise(),
-                self.nfields.serialise(),
-                self.nprotos.serialise(),
-                self.nbindings.serialise(),
-                b"".join([field.serialise() for field in self.fields]),
-                b"".join([proto.serialise() for proto in self.protos]),
-                b"".join([binding.serialise() for binding in self.bindings]),
-            ]
-        )
+        self.name.serialise_into(buf)
+        self.super.serialise_into(buf)
+        self._global.serialise_into(buf)
+        self.nfields.serialise_into(buf)
+        self.nprotos.serialise_into(buf)
+        self.nbindings.serialise_into(buf)
+        for field in self.fields:
+            field.serialise_into(buf)
+        for proto in self.protos:
+            proto.serialise_into(buf)
+        for binding in self.bindings:
+            binding.serialise_into(buf)
 
     def resolve_fields(self, code: "Bytecode") -> List[Field]:
         """
@@ -978,17 +1119,27 @@ class Obj(TypeDef):
             var b: Int;
         }
         Where a is field 0 and b is field 1.
+
+        The hierarchy is cached for subclasses until `code.invalidate_proto_field_cache()` is called, so call that after
+        changing any class's `fields` or `super`. Each call returns a new list.
         """
+        return list(self._all_fields(code))
+
+    def _all_fields(self, code: "Bytecode") -> List[Field]:
+        # resolve_fields without the copy, for internal read-only lookups - never mutate the result
         if self.super.value < 0:  # no superclass
             return self.fields
-        fields: List[Field] = []
+        cached = self._resolved_fields
+        if cached is not None and cached[0] is code._fields_token:
+            return cached[1]
+        chain: List[Obj] = []
         visited_types = set()
         current_type: Optional[Obj] = self
         while current_type:
             if id(current_type) in visited_types:
                 raise ValueError("Cyclic inheritance detected in class hierarchy.")
             visited_types.add(id(current_type))
-            fields = current_type.fields + fields
+            chain.append(current_type)
             if current_type.super.value < 0:
                 current_type = None
             else:
@@ -996,6 +1147,9 @@ class Obj(TypeDef):
                 if not isinstance(defn, Obj):
                     raise ValueError("Invalid superclass type.")
                 current_type = defn
+        # base class fields come first; build the list once instead of re-copying it at every level
+        fields = [field for obj in reversed(chain) for field in obj.fields]
+        self._resolved_fields = (code._fields_token, fields)
         return fields
 
     def __str__(self) -> str:
@@ -1053,6 +1207,9 @@ class Ref(TypeDef):
     def serialise(self) -> bytes:
         return self.type.serialise()
 
+    def serialise_into(self, buf: bytearray) -> None:
+        self.type.serialise_into(buf)
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Ref):
             return NotImplemented
@@ -1074,22 +1231,26 @@ class Virtual(TypeDef):
 
     def deserialise(self, f: BinaryIO | BytesIO) -> "Virtual":
         self.nfields.deserialise(f)
-        for _ in range(self.nfields.value):
-            self.fields.append(Field().deserialise(f))
+        self.fields = [Field().deserialise(f) for _ in range(self.nfields.value)]
         return self
 
     def serialise(self) -> bytes:
+        buf = bytearray()
+        self.serialise_into(buf)
+        return bytes(buf)
+
+    def serialise_into(self, buf: bytearray) -> None:
         self.nfields.value = len(self.fields)
-        return b"".join(
-            [
-                self.nfields.serialise(),
-                b"".join([field.serialise() for field in self.fields]),
-            ]
-        )
+        self.nfields.serialise_into(buf)
+        for field in self.fields:
+            field.serialise_into(buf)
 
     def resolve_fields(self, code: "Bytecode") -> List[Field]:
         return self.fields
 
+    def _all_fields(self, code: "Bytecode") -> List[Field]:
+        return self.fields
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Virtual):
             return NotImplemented
@@ -1121,6 +1282,9 @@ class Abstract(TypeDef):
     def serialise(self) -> bytes:
         return self.name.serialise()
 
+    def serialise_into(self, buf: bytearray) -> None:
+        self.name.serialise_into(buf)
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Abstract):
             return NotImplemented
@@ -1144,19 +1308,20 @@ class EnumConstruct(Serialisable):
     def deserialise(self, f: BinaryIO | BytesIO) -> "EnumConstruct":
         self.name.deserialise(f)
         self.nparams.deserialise(f)
-        for _ in range(self.nparams.value):
-            self.params.append(tIndex().deserialise(f))
+        self.params = [tIndex().deserialise(f) for _ in range(self.nparams.value)]
         return self
 
     def serialise(self) -> bytes:
+        buf = bytearray()
+        self.serialise_into(buf)
+        return bytes(buf)
+
+    def serialise_into(self, buf: bytearray) -> None:
         self.nparams.value = len(self.params)
-        return b"".join(
-            [
-                self.name.serialise(),
-                self.nparams.serialise(),
-                b"".join([param.serialise() for param in self.params]),
-            ]
-        )
+        self.name.serialise_into(buf)
+        self.nparams.serialise_into(buf)
+        for param in self.params:
+            param.serialise_into(buf)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, EnumConstruct):
@@ -1181,20 +1346,21 @@ class Enum(TypeDef):
         self.name.deserialise(f)
         self._global.deserialise(f)
         self.nconstructs.deserialise(f)
-        for _ in range(self.nconstructs.value):
-            self.constructs.append(EnumConstruct().deserialise(f))
+        self.constructs = [EnumConstruct().deserialise(f) for _ in range(self.nconstructs.value)]
         return self
 
     def serialise(self) -> bytes:
+        buf = bytearray()
+        self.serialise_into(buf)
+        return bytes(buf)
+
+    def serialise_into(self, buf: bytearray) -> None:
         self.nconstructs.value = len(self.constructs)
-        return b"".join(
-            [
-                self.name.serialise(),
-                self._global.serialise(),
-                self.nconstructs.serialise(),
-                b"".join([construct.serialise() for construct in self.constructs]),
-            ]
-        )
+        self.name.serialise_into(buf)
+        self._global.serialise_into(buf)
+        self.nconstructs.serialise_into(buf)
+        for construct in self.constructs:
+            construct.serialise_into(buf)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Enum):
@@ -1219,6 +1385,9 @@ class Null(TypeDef):
     def serialise(self) -> bytes:
         return self.type.serialise()
 
+    def serialise_into(self, buf: bytearray) -> None:
+        self.type.serialise_into(buf)
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Null):
             return NotImplemented
@@ -1260,6 +1429,9 @@ class Packed(TypeDef):
     def serialise(self) -> bytes:
         return self.inner.serialise()
 
+    def serialise_into(self, buf: bytearray) -> None:
+        self.inner.serialise_into(buf)
+
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Packed):
             return NotImplemented
@@ -1349,28 +1521,23 @@ class Type(Serialisable):
     def deserialise(self, f: BinaryIO | BytesIO) -> "Type":
         # dbg_print(f"Type @ {tell(f)}")
         self.kind.deserialise(f, length=1)
-        try:
-            self.TYPEDEFS[self.kind.value]
-            _def = self.TYPEDEFS[self.kind.value]()
-            if isinstance(_def, TypeDef):
-                deserialised = _def.deserialise(f)
-                if isinstance(deserialised, TypeDef):
-                    self.definition = deserialised
-                else:
-                    raise MalformedBytecode(f"Invalid type definition found @{tell(f)}")
-            else:
-                raise MalformedBytecode(f"Invalid type definition found @{tell(f)}")
-        except IndexError:
+        kind = self.kind.value
+        typedefs = self.TYPEDEFS
+        if kind >= len(typedefs):
             raise MalformedBytecode(f"Invalid type kind found @{tell(f)}")
+        # every entry in TYPEDEFS is a TypeDef whose deserialise returns itself
+        self.definition = typedefs[kind]().deserialise(f)
         return self
 
     def serialise(self) -> bytes:
-        return b"".join(
-            [
-                self.kind.serialise(),
-                self.definition.serialise() if self.definition else b"",
-            ]
-        )
+        buf = bytearray()
+        self.serialise_into(buf)
+        return bytes(buf)
+
+    def serialise_into(self, buf: bytearray) -> None:
+        self.kind.serialise_into(buf)
+        if self.definition:
+            self.definition.serialise_into(buf)
 
     def __str__(self) -> str:
         return f"<Type: {self.kind.value} ({self.definition.__class__.__name__})>"
@@ -1440,14 +1607,15 @@ class Native(Serialisable):
         return caller_indices
 
     def serialise(self) -> bytes:
-        return b"".join(
-            [
-                self.lib.serialise(),
-                self.name.serialise(),
-                self.type.serialise(),
-                self.findex.serialise(),
-            ]
-        )
+        buf = bytearray()
+        self.serialise_into(buf)
+        return bytes(buf)
+
+    def serialise_into(self, buf: bytearray) -> None:
+        self.lib.serialise_into(buf)
+        self.name.serialise_into(buf)
+        self.type.serialise_into(buf)
+        self.findex.serialise_into(buf)
 
 
 class Opcode(Serialisable):
@@ -1490,26 +1658,30 @@ class Opcode(Serialisable):
         self.code.deserialise(f)
         # dbg_print(f"{self.code.value}... ", end="")
         try:
-            _def = opcodes[list(opcodes.keys())[self.code.value]]
+            self.op, params = _OPCODE_TABLE[self.code.value]
         except IndexError:
             raise InvalidOpCode(f"Unknown opcode at {tell(f)} - {self.code.value}")
-        for param, _type in _def.items():
-            if _type in self.TYPE_MAP:
-                self.df[param] = self.TYPE_MAP[_type]().deserialise(f)
-                continue
-            raise InvalidOpCode(f"Invalid opcode definition for {param, _type} at {tell(f)}")
-        self.op = list(opcodes.keys())[self.code.value]
+        df = self.df
+        for param, cls in params:
+            if cls is None:
+                raise InvalidOpCode(f"Invalid opcode definition for {param, opcodes[self.op][param]} at {tell(f)}")
+            df[param] = cls().deserialise(f)
         return self
 
     def serialise(self) -> bytes:
+        buf = bytearray()
+        self.serialise_into(buf)
+        return bytes(buf)
+
+    def serialise_into(self, buf: bytearray) -> None:
         if self.op:
-            self.code.value = list(opcodes.keys()).index(self.op)
-        return b"".join(
-            [
-                self.code.serialise(),
-                b"".join([definition.serialise() for name, definition in self.df.items()]),
-            ]
-        )
+            code = _OPCODE_CODES.get(self.op)
+            if code is None:
+                raise ValueError(f"Unknown opcode {self.op!r}")
+            self.code.value = code
+        self.code.serialise_into(buf)
+        for definition in self.df.values():
+            definition.serialise_into(buf)
 
     def __repr__(self) -> str:
         return f"<Opcode: {self.op} {self.df}>"
@@ -1518,6 +1690,93 @@ class Opcode(Serialisable):
         return self.__repr__()
 
 
+# For each opcode (by index), its name and the concrete class of each of its params, so decoding an opcode doesn't
+# have to go through the `opcodes` and `Opcode.TYPE_MAP` dicts. Unknown param types map to None.
+_OPCODE_TABLE: Tuple[Tuple[str, Tuple[Tuple[str, Optional[type]], ...]], ...] = tuple(
+    (name, tuple((param, Opcode.TYPE_MAP.get(_type)) for param, _type in _def.items()))
+    for name, _def in opcodes.items()
+)
+# Opcode name -> index, the reverse of `_OPCODE_TABLE`.
+_OPCODE_CODES: Dict[str, int] = {name: code for code, name in enumerate(opcodes)}
+
+# How `_decode_ops` builds each kind of param: a VarInt subclass with no extra state, any other single-VarInt class, an
+# InlineBool, or a counted list (Regs/VarInts).
+_PARAM_PLAIN, _PARAM_CALL, _PARAM_BOOL, _PARAM_LIST = range(4)
+
+
+def _param_kind(cls: Optional[type]) -> int:
+    if cls is InlineBool:
+        return _PARAM_BOOL
+    if cls is Regs or cls is VarInts:
+        return _PARAM_LIST
+    if cls is not None and issubclass(cls, VarInt) and cls.__init__ is VarInt.__init__:
+        return _PARAM_PLAIN
+    return _PARAM_CALL
+
+
+# `_OPCODE_TABLE` with each param's decode kind (and, for lists, element class) attached.
+_OPCODE_DECODE: Tuple[Tuple[str, Tuple[Tuple[str, Optional[type], int, type], ...]], ...] = tuple(
+    (name, tuple((param, cls, _param_kind(cls), Reg if cls is Regs else VarInt) for param, cls in params))
+    for name, params in _OPCODE_TABLE
+)
+
+
+def _decode_ops(buf: bytes, pos: int, nops: int) -> Tuple[List[Opcode], int]:
+    """
+    Decodes `nops` opcodes straight from `buf` starting at `pos`, returning them and the position just past the last
+    one. Produces the same objects as calling `Opcode().deserialise` in a loop, without a stream read per VarInt.
+    """
+    ops: List[Opcode] = []
+    table = _OPCODE_DECODE
+    new = object.__new__
+    for _ in range(nops):
+        code = buf[pos]  # every opcode index fits in a single-byte VarInt
+        if code >= len(table):
+            raise InvalidOpCode(f"Unknown opcode at {hex(pos)} - {code}")
+        pos += 1
+        # Opcode and plain VarInt params only hold plain attributes, so fill them in without going through __init__
+        op = new(Opcode)
+        op.code = VarInt(code)
+        op.op, params = table[code]
+        op.df = df = {}
+        for param, cls, kind, elem in params:
+            if cls is None:
+                raise InvalidOpCode(f"Invalid opcode definition for {param, opcodes[op.op][param]} at {hex(pos)}")
+            b = buf[pos]
+            if b < 0x80:
+                v = b
+                pos += 1
+            else:
+                v, pos = _read_varint(buf, pos)
+            if kind == _PARAM_PLAIN:
+                o = cast(VarInt, new(cls))
+                o.value = v
+                df[param] = o
+            elif kind == _PARAM_LIST:
+                values = []
+                for _ in range(v):
+                    b = buf[pos]
+                    if b < 0x80:
+                        values.append(elem(b))
+                        pos += 1
+                    else:
+                        x, pos = _read_varint(buf, pos)
+                        values.append(elem(x))
+                lst = cls()
+                lst.n.value = v
+                lst.value = values
+                df[param] = lst
+            elif kind == _PARAM_BOOL:
+                ib = InlineBool()
+                ib.varint.value = v
+                ib.value = bool(v)
+                df[param] = ib
+            else:
+                df[param] = cls(v)
+        ops.append(op)
+    return ops, pos
+
+
 class fileRef(ResolvableVarInt):
     """
     Reference to a file in the debug info.
@@ -1555,6 +1814,56 @@ class fileRef(ResolvableVarInt):
         return self.value == other.value and self.line == other.line
 
 
+# Debug info opcode kind for every possible tag byte, resolving the bit cascade up front (bit 0 wins over bit 1 wins
+# over bit 2): 0 = absolute line, 1 = file change, 2 = repeat, 3 = small line delta.
+_DEBUGINFO_KIND = bytes((1 if c & 1 else 2 if c & 2 else 3 if c & 4 else 0) for c in range(256))
+
+
+def _decode_debuginfo(buf: bytes, pos: int, nops: int) -> Tuple[List[fileRef], int]:
+    """
+    Decodes the delta-encoded debug info of a function with `nops` opcodes from `buf`, starting at `pos`. Returns the
+    decoded refs and the position just past the last byte consumed. Truncated input stops decoding early.
+    """
+    refs: List[fileRef] = []
+    append = refs.append
+    kinds = _DEBUGINFO_KIND
+    currfile = -1
+    currline = 0
+    i = 0
+    end = len(buf)
+    while i < nops and pos < end:
+        c = buf[pos]
+        kind = kinds[c]
+        # branches are ordered by how often each kind shows up in real bytecode
+        if kind == 2:
+            count = (c >> 2) & 15
+            for _ in range(count):
+                append(fileRef(currfile, currline))
+            i += count
+            currline += c >> 6
+            pos += 1
+        elif kind == 1:
+            if pos + 1 >= end:
+                pos = end
+                break
+            currfile = ((c >> 1) << 8) | buf[pos + 1]
+            pos += 2
+        elif kind == 0:
+            if pos + 2 >= end:
+                pos = end
+                break
+            currline = (c >> 3) | (buf[pos + 1] << 5) | (buf[pos + 2] << 13)
+            append(fileRef(currfile, currline))
+            i += 1
+            pos += 3
+        else:
+            currline += c >> 3
+            append(fileRef(currfile, currline))
+            i += 1
+            pos += 1
+    return refs, pos
+
+
 class DebugInfo(Serialisable):
     """
     Represents debug information for a function, encoded with a delta encoding scheme for compression.
@@ -1566,99 +1875,61 @@ class DebugInfo(Serialisable):
         self.value: List[fileRef] = []
 
     def deserialise(self, f: BinaryIO | BytesIO, nops: int) -> "DebugInfo":
-        tmp = []
-        currfile: int = -1
-        currline: int = 0
-        i = 0
-        while i < nops:
-            try:
-                c_byte = f.read(1)
-                if not c_byte:
-                    break
-                c = ctypes.c_uint8(ord(c_byte)).value
-                if c & 1 != 0:
-                    c >>= 1
-                    b2_byte = f.read(1)
-                    if not b2_byte:
-                        break
-                    currfile = (c << 8) | ctypes.c_uint8(ord(b2_byte)).value
-                elif c & 2 != 0:
-                    delta = c >> 6
-                    count = (c >> 2) & 15
-                    for _ in range(count):
-                        tmp.append(fileRef(currfile, currline))
-                        i += 1
-                    currline += delta
-                elif c & 4 != 0:
-                    currline += c >> 3
-                    tmp.append(fileRef(currfile, currline))
-                    i += 1
-                else:
-                    b2_byte, b3_byte = f.read(1), f.read(1)
-                    if not b2_byte or not b3_byte:
-                        break
-                    b2 = ctypes.c_uint8(ord(b2_byte)).value
-                    b3 = ctypes.c_uint8(ord(b3_byte)).value
-                    currline = (c >> 3) | (b2 << 5) | (b3 << 13)
-                    tmp.append(fileRef(currfile, currline))
-                    i += 1
-            except (IOError, IndexError):
-                break
-        self.value = tmp
+        buf, pos = _buffer_of(f)
+        self.value, end = _decode_debuginfo(buf, pos, nops)
+        f.seek(end - pos, 1)
         return self
 
-    def _flush_repeat(
-        self,
-        w: BinaryIO | BytesIO,
-        curpos: ctypes.c_size_t,
-        rcount: ctypes.c_size_t,
-        pos: int,
-    ) -> None:
-        if rcount.value > 0:
-            if rcount.value > 15:
-                w.write(ctypes.c_uint8((15 << 2) | 2).value.to_bytes(1, "little"))
-                rcount.value -= 15
-                self._flush_repeat(w, curpos, rcount, pos)
-            else:
-                delta = pos - curpos.value
-                delta = delta if 0 < delta < 4 else 0
-                w.write(ctypes.c_uint8(((delta << 6) | (rcount.value << 2) | 2)).value.to_bytes(1, "little"))
-                rcount.value = 0
-                curpos.value += delta
+    @staticmethod
+    def _flush_repeat(w: bytearray, curpos: int, rcount: int, pos: int) -> int:
+        """
+        Writes out `rcount` pending line repeats, returning the updated current line.
+        """
+        while rcount > 15:
+            w.append((15 << 2) | 2)
+            rcount -= 15
+        if rcount > 0:
+            delta = pos - curpos
+            delta = delta if 0 < delta < 4 else 0
+            w.append(((delta << 6) | (rcount << 2) | 2) & 0xFF)
+            curpos += delta
+        return curpos
 
     def serialise(self) -> bytes:
-        w = BytesIO()
+        w = bytearray()
         curfile = -1
-        curpos = ctypes.c_size_t(0)
-        rcount = ctypes.c_size_t(0)
+        curpos = 0
+        rcount = 0
 
         for ref in self.value:
             f = ref.value
             p = ref.line
             if f != curfile:
-                self._flush_repeat(w, curpos, rcount, p)
+                curpos = self._flush_repeat(w, curpos, rcount, p)
+                rcount = 0
                 curfile = f
-                w.write(ctypes.c_uint8(((f >> 7) | 1)).value.to_bytes(1, "little"))
-                w.write(ctypes.c_uint8(f & 0xFF).value.to_bytes(1, "little"))
+                w.append(((f >> 7) | 1) & 0xFF)
+                w.append(f & 0xFF)
 
-            if p != curpos.value:
-                self._flush_repeat(w, curpos, rcount, p)
+            if p != curpos:
+                curpos = self._flush_repeat(w, curpos, rcount, p)
+                rcount = 0
 
-            if p == curpos.value:
-                rcount.value += 1
+            if p == curpos:
+                rcount += 1
             else:
-                delta = p - curpos.value
+                delta = p - curpos
                 if 0 < delta < 32:
-                    w.write(ctypes.c_uint8((delta << 3) | 4).value.to_bytes(1, "little"))
+                    w.append((delta << 3) | 4)
                 else:
-                    w.write(ctypes.c_uint8((p << 3) & 0xFF).value.to_bytes(1, "little"))
-                    w.write(ctypes.c_uint8((p >> 5) & 0xFF).value.to_bytes(1, "little"))
-                    w.write(ctypes.c_uint8((p >> 13) & 0xFF).value.to_bytes(1, "little"))
-                curpos.value = p
+                    w.append((p << 3) & 0xFF)
+                    w.append((p >> 5) & 0xFF)
+                    w.append((p >> 13) & 0xFF)
+                curpos = p & _SIZE_T_MASK
 
-        self._flush_repeat(w, curpos, rcount, curpos.value)
+        self._flush_repeat(w, curpos, rcount, curpos)
 
-        return w.getvalue()
+        return bytes(w)
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, DebugInfo):
@@ -1666,6 +1937,66 @@ class DebugInfo(Serialisable):
         return self.value == other.value
 
 
+# For each opcode (by index), whether each of its params is a counted list of VarInts (Regs, JumpOffsets) rather
+# than a single VarInt, taken from `_OPCODE_DECODE`. Enough to step over an opcode without building it.
+_OPCODE_LIST_PARAMS: Tuple[Tuple[bool, ...], ...] = tuple(
+    tuple(kind == _PARAM_LIST for _, _, kind, _ in params) for _, params in _OPCODE_DECODE
+)
+
+
+# Below this many functions, starting a thread pool costs more than it could save.
+_PARALLEL_MIN_FUNCTIONS = 256
+# How much encoded function data `Bytecode.serialise_to` buffers before handing it to the file.
+_SERIALISE_CHUNK_SIZE = 1 << 20
+
+
+def _default_workers() -> Optional[int]:
+    """
+    How many threads to parse function bodies with when the caller doesn't say: one per core on a free-threaded
+    (no-GIL) build, where they actually run in parallel, and none otherwise.
+    """
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    if is_gil_enabled is not None and not is_gil_enabled():
+        return os.cpu_count()
+    return None
+
+
+def _serialise_functions(functions: List["Function"]) -> bytearray:
+    """
+    Serialises a run of functions into a fresh buffer, as a unit of work for parallel serialisation.
+    """
+    buf = bytearray()
+    for func in functions:
+        func.serialise_into(buf)
+    return buf
+
+
+def _skip_function_body(buf: bytes, pos: int, nregs: int, nops: int) -> int:
+    """
+    Steps over the registers and opcodes of a function starting at `pos` without decoding them into objects, returning
+    the position just past the last opcode.
+    """
+    for _ in range(nregs):
+        b = buf[pos]
+        pos += 1 if b < 0x80 else 2 if b < 0xC0 else 4
+    layouts = _OPCODE_LIST_PARAMS
+    for _ in range(nops):
+        code = buf[pos]  # every opcode index fits in a single-byte VarInt
+        if code >= len(layouts):
+            raise InvalidOpCode(f"Unknown opcode at {hex(pos)} - {code}")
+        pos += 1
+        for is_list in layouts[code]:
+            if is_list:
+                n, pos = _read_varint(buf, pos)
+                for _ in range(n):
+                    b = buf[pos]
+                    pos += 1 if b < 0x80 else 2 if b < 0xC0 else 4
+            else:
+                b = buf[pos]
+                pos += 1 if b < 0x80 else 2 if b < 0xC0 else 4
+    return pos
+
+
 class Function(Serialisable):
     """
     Represents a function in the bytecode. Due to the interesting ways in which HashLink works, this does not have a name or a signature, but rather a return type and a list of registers and opcodes.
@@ -1676,14 +2007,15 @@ class Function(Serialisable):
         "findex",
         "nregs",
         "nops",
-        "regs",
-        "ops",
+        "_regs",
+        "_ops",
         "has_debug",
         "version",
         "debuginfo",
         "nassigns",
         "assigns",
-        "calls",
+        "_calls",
+        "_body",
     )
 
     def __init__(self) -> None:
@@ -1691,14 +2023,60 @@ class Function(Serialisable):
         self.findex = fIndex()
         self.nregs = VarInt()
         self.nops = VarInt()
-        self.regs: List[tIndex] = []
-        self.ops: List[Opcode] = []
+        self._regs: List[tIndex] = []
+        self._ops: List[Opcode] = []
         self.has_debug: Optional[bool] = None
         self.version: Optional[int] = None
         self.debuginfo: Optional[DebugInfo] = None
         self.nassigns: Optional[VarInt] = None
         self.assigns: Optional[List[Tuple[strRef, VarInt]]] = None
-        self.calls: List[fIndex] = []
+        self._calls: List[fIndex] = []
+        self._body: Optional[Tuple[bytes, int, int]] = None
+        """Buffer and start/end offsets of the not-yet-parsed registers and opcodes, when lazily deserialised."""
+
+    @property
+    def regs(self) -> List[tIndex]:
+        """The types of this function's registers."""
+        if self._body is not None:
+            self._load_body()
+        return self._regs
+
+    @regs.setter
+    def regs(self, value: List[tIndex]) -> None:
+        if self._body is not None:
+            self._load_body()
+        self._regs = value
+
+    @property
+    def ops(self) -> List[Opcode]:
+        """This function's opcodes."""
+        if self._body is not None:
+            self._load_body()
+        return self._ops
+
+    @ops.setter
+    def ops(self, value: List[Opcode]) -> None:
+        if self._body is not None:
+            self._load_body()
+        self._ops = value
+
+    @property
+    def calls(self) -> List[fIndex]:
+        """The fIndexes of all functions directly called (by Call0-4/CallN) from this function."""
+        if self._body is not None:
+            self._load_body()
+        return self._calls
+
+    @calls.setter
+    def calls(self, value: List[fIndex]) -> None:
+        if self._body is not None:
+            self._load_body()
+        self._calls = value
+
+    @property
+    def is_loaded(self) -> bool:
+        """False if this function was lazily deserialised and its registers and opcodes haven't been parsed yet."""
+        return self._body is None
 
     def called_by(self, code: "Bytecode") -> List[fIndex]:
         """
@@ -1736,28 +2114,50 @@ class Function(Serialisable):
             return fun_type.nargs.value
         return 0
 
-    def deserialise(self, f: BinaryIO | BytesIO, has_debug: bool, version: int) -> "Function":
+    def deserialise(self, f: BinaryIO | BytesIO, has_debug: bool, version: int, lazy: bool = False) -> "Function":
+        """
+        Deserialise a function. With `lazy=True`, the registers and opcodes are only skipped over and get parsed the
+        first time `regs`, `ops` or `calls` is accessed.
+        """
         self.has_debug = has_debug
         self.version = version
         self.type.deserialise(f)
         self.findex.deserialise(f)
         self.nregs.deserialise(f)
         self.nops.deserialise(f)
-        for _ in range(self.nregs.value):
-            self.regs.append(tIndex().deserialise(f))
-        for _ in range(self.nops.value):
-            self.ops.append(Opcode().deserialise(f))
-            if self.ops[-1].op in simple_calls and "fun" in self.ops[-1].df:
-                self.calls.append(self.ops[-1].df["fun"])
+        if lazy:
+            buf, pos = _buffer_of(f)
+            end = _skip_function_body(buf, pos, self.nregs.value, self.nops.value)
+            self._body = (buf, pos, end)
+            f.seek(end - pos, 1)
+        else:
+            self._regs, self._ops, self._calls = self._deserialise_body(f)
         if self.has_debug:
             self.debuginfo = DebugInfo().deserialise(f, self.nops.value)
             if self.version >= 3:
                 self.nassigns = VarInt().deserialise(f)
-                self.assigns = []
-                for _ in range(self.nassigns.value):
-                    self.assigns.append((strRef().deserialise(f), VarInt().deserialise(f)))
+                self.assigns = [(strRef().deserialise(f), VarInt().deserialise(f)) for _ in range(self.nassigns.value)]
         return self
 
+    def _deserialise_body(self, f: BinaryIO | BytesIO) -> Tuple[List[tIndex], List[Opcode], List[fIndex]]:
+        regs = [tIndex(v) for v in _read_varint_run(f, self.nregs.value)]
+        buf, pos = _buffer_of(f)
+        ops, end = _decode_ops(buf, pos, self.nops.value)
+        f.seek(end - pos, 1)
+        calls = [op.df["fun"] for op in ops if op.op in simple_calls and "fun" in op.df]
+        return regs, ops, calls
+
+    def _load_body(self) -> None:
+        body = self._body
+        if body is None:  # another thread finished loading it first
+            return
+        buf, pos, _ = body
+        f = BytesIO(buf)
+        f.seek(pos)
+        # only mark the body as loaded once it parsed, so a malformed body keeps raising instead of reading as empty
+        self._regs, self._ops, self._calls = self._deserialise_body(f)
+        self._body = None
+
     def insert_op(self, code: "Bytecode", idx: int, op: Opcode, debugRef: Optional[fileRef] = None) -> None:
         """
         Insert an Opcode into this function at the given position, adding a blank debug fileRef if none is passed.
@@ -1783,35 +2183,52 @@ class Function(Serialisable):
         return len(self.ops) - 1
 
     def serialise(self) -> bytes:
+        buf = bytearray()
+        self.serialise_into(buf)
+        return bytes(buf)
+
+    def serialise_into(self, buf: bytearray) -> None:
+        if self._body is not None:
+            # never parsed, so nothing can have changed - copy the original registers and opcodes over as-is
+            self.type.serialise_into(buf)
+            self.findex.serialise_into(buf)
+            self.nregs.serialise_into(buf)
+            self.nops.serialise_into(buf)
+            body, start, end = self._body
+            buf += body[start:end]
+            self._serialise_debug_into(buf)
+            return
         self.nops.value = len(self.ops)
         self.nregs.value = len(self.regs)
-        if self.assigns:
-            self.nassigns = VarInt(len(self.assigns) if self.assigns else 0)
         if self.has_debug and self.debuginfo:
             assert len(self.debuginfo.value) == self.nops.value, (
                 f"Invalid number of debugrefs - {len(self.debuginfo.value)} (debuginfo) != {self.nops.value} (nops) - did you use insert_op?"
             )
-        res = b"".join(
-            [
-                self.type.serialise(),
-                self.findex.serialise(),
-                self.nregs.serialise(),
-                self.nops.serialise(),
-                b"".join([reg.serialise() for reg in self.regs]),
-                b"".join([op.serialise() for op in self.ops]),
-            ]
-        )
+        self.type.serialise_into(buf)
+        self.findex.serialise_into(buf)
+        self.nregs.serialise_into(buf)
+        self.nops.serialise_into(buf)
+        for reg in self.regs:
+            reg.serialise_into(buf)
+        for op in self.ops:
+            op.serialise_into(buf)
+        self._serialise_debug_into(buf)
+
+    def _serialise_debug_into(self, buf: bytearray) -> None:
+        if self.assigns:
+            self.nassigns = VarInt(len(self.assigns))
         if self.has_debug and self.debuginfo:
-            res += self.debuginfo.serialise()
+            self.debuginfo.serialise_into(buf)
             if self.version and self.version >= 3:
                 # HL's loader always reads nassigns+assigns here for v>=3 with
                 # debug info; write an empty list if we have none to keep the
                 # stream aligned.
                 nassigns = self.nassigns if self.nassigns else VarInt(0)
                 assigns = self.assigns if self.assigns is not None else []
-                res += nassigns.serialise()
-                res += b"".join([b"".join([v.serialise() for v in assign]) for assign in assigns])
-        return res
+                nassigns.serialise_into(buf)
+                for assign in assigns:
+                    for v in assign:
+                        v.serialise_into(buf)
 
 
 class Constant(Serialisable):
@@ -1829,19 +2246,20 @@ class Constant(Serialisable):
     def deserialise(self, f: BinaryIO | BytesIO) -> "Constant":
         self._global.deserialise(f)
         self.nfields.deserialise(f)
-        for _ in range(self.nfields.value):
-            self.fields.append(VarInt().deserialise(f))
+        self.fields = [VarInt().deserialise(f) for _ in range(self.nfields.value)]
         return self
 
     def serialise(self) -> bytes:
+        buf = bytearray()
+        self.serialise_into(buf)
+        return bytes(buf)
+
+    def serialise_into(self, buf: bytearray) -> None:
         self.nfields.value = len(self.fields)
-        return b"".join(
-            [
-                self._global.serialise(),
-                self.nfields.serialise(),
-                b"".join([field.serialise() for field in self.fields]),
-            ]
-        )
+        self._global.serialise_into(buf)
+        self.nfields.serialise_into(buf)
+        for field in self.fields:
+            field.serialise_into(buf)
 
 
 class Bytecode(Serialisable):
@@ -1889,14 +2307,19 @@ class Bytecode(Serialisable):
         self.constants: List[Constant] = []
 
         self.initialized_globals: Dict[int, Any] = {}
+        self._const_strings: Dict[int, str] = {}
 
         self.section_offsets: Dict[str, int] = {}
+        self._section_index: Optional[Tuple[Tuple[Tuple[str, int], ...], List[int], List[str]]] = None
+        self._section_base = 0
+        self.tracked_sections = False
         self.cached_all: List[Type] | None = None
         self._findex_map: Dict[int, "Function | Native"] | None = None
         self._proto_map: Dict[int, "Proto"] | None = None
         self._field_map: Dict[int, "Field"] | None = None
         self._proto_owner_map: Dict[int, "Obj"] | None = None
         self._field_owner_map: Dict[int, "Obj"] | None = None
+        self._fields_token = object()
         self._xref_index: Optional[XrefIndex] = None
         self._search_index: Optional[SearchIndex] = None
         self._source_map: Optional[SourceMap] = None
@@ -1919,13 +2342,15 @@ class Bytecode(Serialisable):
 
     def invalidate_proto_field_cache(self) -> None:
         """
-        Invalidates the lazily-built findex -> Proto/Field maps. Call this after mutating
-        `self.types` (or a type's `protos`/`bindings`) outside of normal deserialisation.
+        Invalidates the lazily-built findex -> Proto/Field maps and the cached results of
+        `Obj.resolve_fields`. Call this after mutating `self.types` (or a type's
+        `fields`/`protos`/`bindings`) outside of normal deserialisation.
         """
         self._proto_map = None
         self._field_map = None
         self._proto_owner_map = None
         self._field_owner_map = None
+        self._fields_token = object()
 
     def _build_proto_field_maps(self) -> None:
         proto_map: Dict[int, "Proto"] = {}
@@ -2067,18 +2492,13 @@ class Bytecode(Serialisable):
         self.virtuals_built = True
 
     def _find_magic(self, f: BinaryIO | BytesIO, magic: bytes = b"HLB") -> None:
-        buffer_size = 1024
-        offset = 0
-        while True:
-            chunk = f.read(buffer_size)
-            if not chunk:
-                raise NoMagic("Reached the end of file without finding magic bytes.")
-            index = chunk.find(magic)
-            if index != -1:
-                f.seek(offset + index)
-                dbg_print(f"Found bytecode at {tell(f)}... ", end="")
-                return
-            offset += buffer_size
+        # one C-level search over the rest of the stream, which also catches a magic straddling any chunk boundary
+        buf, pos = _buffer_of(f)
+        index = buf.find(magic, pos)
+        if index == -1:
+            raise NoMagic("Reached the end of file without finding magic bytes.")
+        f.seek(index - pos, 1)
+        dbg_print(f"Found bytecode at {tell(f)}... ", end="")
 
     @classmethod
     def from_path(
@@ -2086,19 +2506,25 @@ class Bytecode(Serialisable):
         path: str,
         search_magic: bool = True,
         progress_cb: Optional[ProgressCallback] = None,
+        lazy: bool = False,
+        track_sections: Optional[bool] = None,
+        workers: Optional[int] = None,
     ) -> "Bytecode":
         """
-        Create a new Bytecode instance from a file path.
+        Create a new Bytecode instance from a file path. See `deserialise` for what `lazy`, `track_sections` and `workers` do.
         """
-        f = open(path, "rb")
-        instance = cls().deserialise(f, search_magic=search_magic, progress_cb=progress_cb)
-        f.close()
-        try:
-            with open(path, "rb") as hf:
-                instance.sha256 = hashlib.sha256(hf.read()).hexdigest()
-            instance.source_path = path
-        except OSError:
-            pass
+        # one read serves both parsing (from memory) and hashing
+        with open(path, "rb") as f:
+            data = f.read()
+        instance = cls.from_bytes(
+            data,
+            search_magic=search_magic,
+            progress_cb=progress_cb,
+            lazy=lazy,
+            track_sections=track_sections,
+            workers=workers,
+        )
+        instance.source_path = path
         return instance
 
     @classmethod
@@ -2107,12 +2533,22 @@ class Bytecode(Serialisable):
         data: bytes,
         search_magic: bool = True,
         progress_cb: Optional[ProgressCallback] = None,
+        lazy: bool = False,
+        track_sections: Optional[bool] = None,
+        workers: Optional[int] = None,
     ) -> "Bytecode":
         """
-        Create a new Bytecode instance from a `bytes` object.
+        Create a new Bytecode instance from a `bytes` object. See `deserialise` for what `lazy`, `track_sections` and `workers` do.
         """
         f = BytesIO(data)
-        instance = cls().deserialise(f, search_magic=search_magic, progress_cb=progress_cb)
+        instance = cls().deserialise(
+            f,
+            search_magic=search_magic,
+            progress_cb=progress_cb,
+            lazy=lazy,
+            track_sections=track_sections,
+            workers=workers,
+        )
         f.close()
         instance.sha256 = hashlib.sha256(data).hexdigest()
         return instance
@@ -2165,10 +2601,19 @@ class Bytecode(Serialisable):
         search_magic: bool = True,
         init_globals: bool = True,
         progress_cb: Optional[ProgressCallback] = None,
+        lazy: bool = False,
+        track_sections: Optional[bool] = None,
+        workers: Optional[int] = None,
     ) -> "Bytecode":
         """
         Deserialise the bytecode in-place from an open binary file handle or a BytesIO object. By default will search for the bytecode magic (b'HLB') anywhere in the file, pass `search_magic=False` to disable.
 
+        With `lazy=True`, function registers and opcodes are only parsed the first time each function's `regs`, `ops` or `calls` is accessed, which makes loading much faster for tools that only look at a few functions.
+
+        Only the start of each top-level section is recorded in `section_offsets` by default. Pass `track_sections=True` (or set the `CRASHLINK_TRACK_SECTIONS` environment variable) to also record every individual int, float, type, global, native, function and constant, at the cost of a slower load; `tracked_sections` records which of the two was used.
+
+        With `workers` set, function bodies are first only stepped over (as with `lazy=True`) and then parsed by a thread pool of that size. Function bodies don't depend on each other, so this scales on free-threaded Python builds; with the GIL it is no faster than a normal load. When left unset, a free-threaded build uses one worker per core and a regular build parses serially.
+
         progress_cb, if provided, is called as ``progress_cb(fraction, status)`` at each parse milestone, where fraction is in [0, 1].
         """
 
@@ -2176,8 +2621,19 @@ class Bytecode(Serialisable):
             if progress_cb is not None:
                 progress_cb(frac, status)
 
-        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
         dbg_print("---- Deserialise ----")
+        if track_sections is None:
+            track_sections = bool(os.environ.get("CRASHLINK_TRACK_SECTIONS"))
+        self.tracked_sections = track_sections
+        source: Optional[BinaryIO] = None
+        self._section_base = 0
+        if not isinstance(f, BytesIO):
+            # parse from memory - the deserialisers do lots of tiny reads, and some decode straight from the buffer.
+            # section offsets stay absolute in the original stream, which is left just past the bytecode afterwards.
+            source = f
+            self._section_base = f.tell()
+            f = BytesIO(f.read())
         if search_magic:
             dbg_print("Searching for magic...")
             self._find_magic(f)
@@ -2187,10 +2643,11 @@ class Bytecode(Serialisable):
         assert self.magic.value == b"HLB", "Incorrect magic found!"
         self.track_section(f, "version")
         self.version.deserialise(f, length=1)
-        dbg_print(f"with version {self.version.value}... ", end="")
+        version = self.version.value
+        dbg_print(f"with version {version}... ", end="")
         self.track_section(f, "flags")
         self.flags.deserialise(f)
-        self.has_debug_info = bool(self.flags.value & 1)
+        self.has_debug_info = has_debug = bool(self.flags.value & 1)
         dbg_print(f"debug info: {self.has_debug_info}. ")
         self.track_section(f, "nints")
         self.nints.deserialise(f)
@@ -2199,7 +2656,7 @@ class Bytecode(Serialisable):
         self.track_section(f, "nstrings")
         self.nstrings.deserialise(f)
 
-        if self.version.value >= 5 and self.nbytes:
+        if version >= 5 and self.nbytes:
             dbg_print(f"Found nbytes (version >= 5) at {tell(f)}")
             self.track_section(f, "nbytes")
             self.nbytes.deserialise(f)
@@ -2215,7 +2672,7 @@ class Bytecode(Serialisable):
         self.track_section(f, "nfunctions")
         self.nfunctions.deserialise(f)
 
-        if self.version.value >= 4 and self.nconstants:
+        if version >= 4 and self.nconstants:
             dbg_print(f"Found nconstants (version >= 4) at {tell(f)}")
             self.track_section(f, "nconstants")
             self.nconstants.deserialise(f)
@@ -2227,15 +2684,24 @@ class Bytecode(Serialisable):
         dbg_print(f"Entrypoint: f@{self.entrypoint.value}")
 
         _progress(0.02, "parsing ints and floats")
+        # both pools are fixed-width, so decode each in one unpack and only wrap the values afterwards
         self.track_section(f, "ints")
-        for i in range(self.nints.value):
-            self.track_section(f, f"int {i}")
-            self.ints.append(SerialisableInt().deserialise(f, length=4))
+        start = f.tell()
+        for i, value in enumerate(_unpack_pool(f, "I", 4, self.nints.value)):
+            if track_sections:
+                self.section_offsets[f"int {i}"] = self._section_base + start + 4 * i
+            _int = SerialisableInt()
+            _int.value = value
+            self.ints.append(_int)
 
         self.track_section(f, "floats")
-        for i in range(self.nfloats.value):
-            self.track_section(f, f"float {i}")
-            self.floats.append(SerialisableF64().deserialise(f))
+        start = f.tell()
+        for i, value in enumerate(_unpack_pool(f, "d", 8, self.nfloats.value)):
+            if track_sections:
+                self.section_offsets[f"float {i}"] = self._section_base + start + 8 * i
+            _float = SerialisableF64()
+            _float.value = value
+            self.floats.append(_float)
 
         _progress(0.04, "parsing strings")
         dbg_print(f"Strings section starts at {tell(f)}")
@@ -2244,7 +2710,7 @@ class Bytecode(Serialisable):
         dbg_print(f"Strings section ends at {tell(f)}")
         assert self.nstrings.value == len(self.strings.value), "nstrings and len of strings don't match!"
 
-        if self.version.value >= 5 and self.bytes and self.nbytes:
+        if version >= 5 and self.bytes and self.nbytes:
             dbg_print("Deserialising bytes... >=5")
             self.track_section(f, "bytes")
             self.bytes.deserialise(f, self.nbytes.value)
@@ -2269,7 +2735,8 @@ class Bytecode(Serialisable):
         _ntypes = self.ntypes.value
         _report_every_type = max(1, _ntypes // 100)
         for i in range(_ntypes):
-            self.track_section(f, f"type {i}")
+            if track_sections:
+                self.track_section(f, f"type {i}")
             self.types.append(Type().deserialise(f))
             if i % _report_every_type == 0:
                 _progress(0.07 + (i / _ntypes) * 0.13, "parsing types")
@@ -2277,32 +2744,45 @@ class Bytecode(Serialisable):
         _progress(0.20, "parsing globals")
         self.track_section(f, "globals")
         for i in range(self.nglobals.value):
-            self.track_section(f, f"global {i}")
+            if track_sections:
+                self.track_section(f, f"global {i}")
             self.global_types.append(tIndex().deserialise(f))
         dbg_print(f"Natives starting at {tell(f)}")
         _progress(0.22, "parsing natives")
         self.track_section(f, "natives")
         for i in range(self.nnatives.value):
-            self.track_section(f, f"native {i}")
+            if track_sections:
+                self.track_section(f, f"native {i}")
             self.natives.append(Native().deserialise(f))
         dbg_print(f"Functions starting at {tell(f)}")
         _progress(0.23, "parsing functions")
         self.track_section(f, "functions")
         _nfunctions = self.nfunctions.value
         _report_every_func = max(1, _nfunctions // 200)
+        if workers is None:
+            workers = _default_workers()
+        parallel = not lazy and workers is not None and workers > 1 and _nfunctions >= _PARALLEL_MIN_FUNCTIONS
         for i in range(_nfunctions):
-            self.track_section(f, f"function {i}")
-            self.functions.append(Function().deserialise(f, self.has_debug_info, self.version.value))
+            if track_sections:
+                self.track_section(f, f"function {i}")
+            self.functions.append(Function().deserialise(f, has_debug, version, lazy=lazy or parallel))
             if i % _report_every_func == 0:
                 _progress(0.23 + (i / _nfunctions) * 0.65, "parsing functions")
+        if parallel:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # each body gets its own BytesIO over the shared (immutable) buffer
+                list(pool.map(Function._load_body, [func for func in self.functions if func._body is not None]))
         if self.nconstants is not None:
             _progress(0.88, "parsing constants")
             dbg_print(f"Constants starting at {tell(f)}")
             self.track_section(f, "constants")
             for i in range(self.nconstants.value):
-                self.track_section(f, f"constant {i}")
+                if track_sections:
+                    self.track_section(f, f"constant {i}")
                 self.constants.append(Constant().deserialise(f))
         dbg_print(f"Bytecode end at {tell(f)}.")
+        if source is not None:
+            source.seek(self._section_base + f.tell())
         self.deserialised = True
         if init_globals:
             _progress(0.90, "initializing globals")
@@ -2315,7 +2795,7 @@ class Bytecode(Serialisable):
             dbg_print("Mapping statics...")
             self.map_statics()
         _progress(1.00, "done")
-        dbg_print(f"{(datetime.now() - start_time).total_seconds()}s elapsed.")
+        dbg_print(f"{(time.perf_counter_ns() - start_ns) / 1e9:.6f}s elapsed.")
         return self
 
     def init_globals(self) -> None:
@@ -2351,6 +2831,12 @@ class Bytecode(Serialisable):
                 "Not all constants were resolved! This is often due to bad DebugInfo blocks causing buffer overrun, try passing -N to troubleshoot."
             )
         self.initialized_globals = final
+        self._const_strings = {}
+        for gindex in final:
+            try:
+                self._const_strings[gindex] = self._lookup_const_str(gindex)
+            except (ValueError, TypeError):
+                pass  # not a String constant (or a malformed one) - const_str raises for it on demand
 
     def map_statics(self) -> None:
         """
@@ -2418,7 +2904,13 @@ class Bytecode(Serialisable):
         """
         Gets the value of an initialized global constant `String`.
         """
-        # TODO: is this overcomplicated?
+        res = self._const_strings.get(gindex)
+        if res is not None:
+            return res
+        # slow path, only to raise the right error (or for globals added after init_globals)
+        return self._lookup_const_str(gindex)
+
+    def _lookup_const_str(self, gindex: int) -> str:
         if gindex not in self.initialized_globals:
             if gindex < 0 or gindex >= len(self.global_types):
                 raise ValueError(f"Global {gindex} not found!")
@@ -2431,68 +2923,96 @@ class Bytecode(Serialisable):
         obj_fields = obj.resolve_fields(self)
         if len(obj_fields) != 2:
             raise ValueError(f"Global {gindex} seems malformed!")
-        res = self.initialized_globals[gindex][obj_fields[0].name.resolve(self)]
+        res = self.initialized_globals[gindex].get(obj_fields[0].name.resolve(self))
+        if res is None:
+            raise ValueError(f"Global {gindex} seems malformed!")
         if not isinstance(res, str):
             raise TypeError("This should never happen!")
         return res
 
-    def serialise(self, auto_set_meta: bool = True) -> bytes:
+    def serialise(self, auto_set_meta: bool = True, workers: Optional[int] = None) -> bytes:
         """
         Serialise the bytecode to a `bytes` object.
+
+        With `workers` set, the function table is encoded in chunks by a thread pool of that size and stitched back
+        together in order. Like parallel deserialisation, this only scales on free-threaded Python builds.
         """
-        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
         dbg_print("---- Serialise ----")
         if auto_set_meta:
             dbg_print("Setting meta...")
             self.set_meta()
-        res = b"".join(
-            [
-                self.magic.serialise(),
-                self.version.serialise(),
-                self.flags.serialise(),
-                self.nints.serialise(),
-                self.nfloats.serialise(),
-                self.nstrings.serialise(),
-            ]
-        )
+        res = b"".join(self._serialise_chunks(workers))
+        dbg_print(f"Final size: {hex(len(res))}")
+        dbg_print(f"{(time.perf_counter_ns() - start_ns) / 1e9:.6f}s elapsed.")
+        return res
+
+    def serialise_to(self, fp: BinaryIO, auto_set_meta: bool = True, workers: Optional[int] = None) -> int:
+        """
+        Serialise the bytecode straight into a writable binary file object, a section (or a batch of functions) at a
+        time, without holding the whole output in memory. Returns the number of bytes written.
+        """
+        if auto_set_meta:
+            self.set_meta()
+        written = 0
+        for chunk in self._serialise_chunks(workers):
+            fp.write(chunk)
+            written += len(chunk)
+        return written
+
+    def _serialise_chunks(self, workers: Optional[int] = None) -> Iterator[bytes | bytearray]:
+        """
+        Yields the serialised bytecode in order, as buffers of roughly `_SERIALISE_CHUNK_SIZE` bytes or more.
+        """
+        version = self.version.value
+        res = bytearray(_struct_header.pack(self.magic.value, version))
+        self.flags.serialise_into(res)
+        self.nints.serialise_into(res)
+        self.nfloats.serialise_into(res)
+        self.nstrings.serialise_into(res)
         dbg_print(f"VarInt block 1 at {hex(len(res))}")
-        if self.version.value >= 5 and self.nbytes:
-            res += self.nbytes.serialise()
-        res += b"".join(
-            [
-                self.ntypes.serialise(),
-                self.nglobals.serialise(),
-                self.nnatives.serialise(),
-                self.nfunctions.serialise(),
-            ]
-        )
+        if version >= 5 and self.nbytes:
+            self.nbytes.serialise_into(res)
+        self.ntypes.serialise_into(res)
+        self.nglobals.serialise_into(res)
+        self.nnatives.serialise_into(res)
+        self.nfunctions.serialise_into(res)
         dbg_print(f"VarInt block 2 at {hex(len(res))}")
-        if self.version.value >= 4 and self.nconstants:
-            res += self.nconstants.serialise()
-        res += self.entrypoint.serialise()
-        res += b"".join([i.serialise() for i in self.ints])
-        res += b"".join([f.serialise() for f in self.floats])
-        res += self.strings.serialise()
-        if self.version.value >= 5 and self.bytes:
-            res += self.bytes.serialise()
+        if version >= 4 and self.nconstants:
+            self.nconstants.serialise_into(res)
+        self.entrypoint.serialise_into(res)
+        res += _pack_ints(self.ints)
+        res += struct.pack(f"<{len(self.floats)}d", *[f.value for f in self.floats])
+        yield res
+        yield self.strings.serialise()
+        if version >= 5 and self.bytes:
+            yield self.bytes.serialise()
+        res = bytearray()
         if self.has_debug_info and self.ndebugfiles and self.debugfiles:
-            res += b"".join([self.ndebugfiles.serialise(), self.debugfiles.serialise()])
-        res += b"".join(
-            [
-                b"".join([typ.serialise() for typ in self.types]),
-                b"".join([typ.serialise() for typ in self.global_types]),
-                b"".join([native.serialise() for native in self.natives]),
-            ]
-        )
-        if USE_TQDM:
-            res += b"".join([func.serialise() for func in tqdm(self.functions)])
+            self.ndebugfiles.serialise_into(res)
+            res += self.debugfiles.serialise()
+        for typ in self.types:
+            typ.serialise_into(res)
+        for gtyp in self.global_types:
+            gtyp.serialise_into(res)
+        for native in self.natives:
+            native.serialise_into(res)
+        yield res
+        res = bytearray()
+        if workers is not None and workers > 1 and len(self.functions) >= _PARALLEL_MIN_FUNCTIONS:
+            size = -(-len(self.functions) // workers)
+            chunks = [self.functions[i : i + size] for i in range(0, len(self.functions), size)]
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                yield from pool.map(_serialise_functions, chunks)
         else:
-            res += b"".join([func.serialise() for func in self.functions])
-        if self.constants:
-            res += b"".join([constant.serialise() for constant in self.constants])
-        dbg_print(f"Final size: {hex(len(res))}")
-        dbg_print(f"{(datetime.now() - start_time).total_seconds()}s elapsed.")
-        return res
+            for func in tqdm(self.functions) if USE_TQDM else self.functions:
+                func.serialise_into(res)
+                if len(res) >= _SERIALISE_CHUNK_SIZE:
+                    yield res
+                    res = bytearray()
+        for constant in self.constants:
+            constant.serialise_into(res)
+        yield res
 
     def set_meta(self) -> None:
         """
@@ -2605,7 +3125,8 @@ class Bytecode(Serialisable):
         """
         Internal helper function to denote the location of a data section at a given offset.
         """
-        self.section_offsets[section_name] = f.tell()
+        self.section_offsets[section_name] = self._section_base + f.tell()
+        self._section_index = None
 
     def section_at(self, offset: int) -> Optional[str]:
         """
@@ -2613,10 +3134,14 @@ class Bytecode(Serialisable):
         """
         # returns the name of the section at the offset:
         # if the offset is after a section start and before the next section start, it's still in the first section
-        for section_name, section_offset in list(reversed(self.section_offsets.items())):
-            if offset >= section_offset:
-                return section_name
-        return None
+        items = tuple(self.section_offsets.items())
+        index = self._section_index
+        if index is None or index[0] != items:  # also catches section_offsets edited in place
+            # stable sort, so sections starting at the same offset keep their tracking order and the last one wins
+            ordered = sorted(items, key=lambda item: item[1])
+            index = self._section_index = (items, [start for _, start in ordered], [name for name, _ in ordered])
+        i = bisect_right(index[1], offset)
+        return index[2][i - 1] if i else None
 
     def add_string(self, string: str) -> strRef:
         """
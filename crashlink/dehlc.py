@@ -453,6 +453,7 @@ def code_from_bin(
     vd.kind.value = Type.Kind.VOID.value
     vd.definition = None
     code.types.insert(0, vd)
+    code.invalidate_proto_field_cache()
 
     # TODO: functions, stubs, strings, bytes, ints, and a whole buncha other stuff
 
@@ -52,6 +52,9 @@ def set_dbg_callback(cb: Optional[Callable[[str], None]]) -> None:
 
 def dbg_print(*args: Any, **kwargs: Any) -> None:
     """Print if DEBUG is True; always forward to the GUI callback when one is registered."""
+    if _dbg_callback is None and not DEBUG:
+        # skip stringifying the args (opcodes, register lists...) when nobody will see them
+        return
     msg = " ".join(str(a) for a in args)
     if _dbg_callback is not None:
         _dbg_callback(msg)
@@ -6,7 +6,7 @@ Core VM types, values, and the VM itself.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional
 
 from ..core import (
     F32,
@@ -19,6 +19,7 @@ from ..core import (
     Bytecode,
     Bytes,
     Function,
+    Native,
     Obj,
     Type,
 )
@@ -286,6 +287,7 @@ class VM:
         self.callstack: List[VMFunction] = []
         dbg_print("Wrapping functions...")
         self.funcs = [VMFunction(code, func) for func in code.functions]
+        self._funcs_by_findex: Dict[int, VMFunction] = {func.func.findex.value: func for func in self.funcs}
         self.globals: List[Optional[VMValue]] = []
         dbg_print("Initializing and allocating globals...")
         for i, g in enumerate(code.global_types):
@@ -298,17 +300,17 @@ class VM:
         """
         Finds a wrapped VMFunction or a binding to a native by its findex in the bytecode.
         """
-        for func in self.funcs:
-            if func.func.findex.value == findex:
-                return func
-        for native in self.code.natives:
-            if native.findex.value == findex:
-                name = native.name.resolve(self.code)
-                lib = native.lib.resolve(self.code)
-                for binding in NATIVE_BINDINGS:
-                    if binding.name == name and binding.lib == lib:
-                        return binding
-                raise NameError(f"Native {name} (from {lib}) not found in crashlink std implementation.")
+        func = self._funcs_by_findex.get(findex)
+        if func is not None:
+            return func
+        native = self.code.get_findex_map().get(findex)
+        if isinstance(native, Native):
+            name = native.name.resolve(self.code)
+            lib = native.lib.resolve(self.code)
+            for binding in NATIVE_BINDINGS:
+                if binding.name == name and binding.lib == lib:
+                    return binding
+            raise NameError(f"Native {name} (from {lib}) not found in crashlink std implementation.")
 
     def run(self, entry: Optional[int] = None) -> None:
         """
@@ -15,7 +15,7 @@ from mcp.server.fastmcp import FastMCP
 
 from . import decomp as _decomp
 from . import disasm as _disasm
-from .core import Bytecode, Native, Obj, Enum, Fun
+from .core import Bytecode, Function, Native, Obj, Enum, Fun
 from .core import XRef, TargetKind, SourceKind
 from .hlc import code_to_c
 from .opcodes import opcode_docs, opcodes
@@ -147,13 +147,12 @@ def disassemble_function(findex: int) -> str:
         findex: The function index (findex) to disassemble
     """
     code = _require_code()
-    for func in code.functions:
-        if func.findex.value == findex:
-            return _trim(_disasm.func(code, func))
-    for native in code.natives:
-        if native.findex.value == findex:
-            return _disasm.native_header(code, native)
-    raise RuntimeError(f"Function f@{findex} not found.")
+    func = code.get_findex_map().get(findex)
+    if isinstance(func, Native):
+        return _disasm.native_header(code, func)
+    if not isinstance(func, Function):
+        raise RuntimeError(f"Function f@{findex} not found.")
+    return _trim(_disasm.func(code, func))
 
 
 @mcp.tool()
@@ -169,17 +168,17 @@ def decompile_function(findex: int) -> str:
         findex: The function index to decompile
     """
     code = _require_code()
-    for func in code.functions:
-        if func.findex.value == findex:
-            try:
-                ir = _decomp.IRFunction(code, func)
-                result = pseudo(ir)
-                return _trim(result)
-            except Exception as e:
-                raise RuntimeError(
-                    f"Decompilation failed for f@{findex}: {e}\nTry disassemble_function for a more reliable view."
-                )
-    raise RuntimeError(f"Function f@{findex} not found (only non-native functions can be decompiled).")
+    func = code.get_findex_map().get(findex)
+    if not isinstance(func, Function):
+        raise RuntimeError(f"Function f@{findex} not found (only non-native functions can be decompiled).")
+    try:
+        ir = _decomp.IRFunction(code, func)
+        result = pseudo(ir)
+        return _trim(result)
+    except Exception as e:
+        raise RuntimeError(
+            f"Decompilation failed for f@{findex}: {e}\nTry disassemble_function for a more reliable view."
+        )
 
 
 @mcp.tool()
@@ -224,17 +223,17 @@ def get_ir(findex: int) -> str:
         findex: The function index
     """
     code = _require_code()
-    for func in code.functions:
-        if func.findex.value == findex:
-            try:
-                ir = _decomp.IRFunction(code, func)
-                buf = io.StringIO()
-                with redirect_stdout(buf):
-                    ir.print()
-                return _trim(buf.getvalue())
-            except Exception as e:
-                raise RuntimeError(f"IR generation failed: {e}")
-    raise RuntimeError(f"Function f@{findex} not found.")
+    func = code.get_findex_map().get(findex)
+    if not isinstance(func, Function):
+        raise RuntimeError(f"Function f@{findex} not found.")
+    try:
+        ir = _decomp.IRFunction(code, func)
+        buf = io.StringIO()
+        with redirect_stdout(buf):
+            ir.print()
+        return _trim(buf.getvalue())
+    except Exception as e:
+        raise RuntimeError(f"IR generation failed: {e}")
 
 
 @mcp.tool()
@@ -1,8 +1,15 @@
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from glob import glob
+from io import BytesIO
+from typing import BinaryIO, cast
 
 import pytest
 
 from crashlink import *
+from crashlink import core
 
 test_files = glob("tests/haxe/*.hl")
 
@@ -42,3 +49,209 @@ def test_create_empty():
     code = Bytecode.create_empty()
     assert code.is_ok(), "Bad code!"
     assert Bytecode.from_bytes(code.serialise()).serialise() == code.serialise()
+
+
+@pytest.mark.parametrize("path", test_files)
+def test_lazy_functions(path: str):
+    with open(path, "rb") as f:
+        data = f.read()
+    eager = Bytecode.from_bytes(data)
+    with open(path, "rb") as f:
+        lazy = Bytecode().deserialise(f, lazy=True)
+    assert lazy.is_ok()
+    assert not any(func.is_loaded for func in lazy.functions if func.nops.value)
+    assert lazy.serialise() == data
+    assert not any(func.is_loaded for func in lazy.functions if func.nops.value)  # untouched bodies are copied as-is
+    for a, b in zip(eager.functions, lazy.functions):
+        assert [str(op) for op in a.ops] == [str(op) for op in b.ops]
+        assert a.regs == b.regs
+        assert [c.value for c in a.calls] == [c.value for c in b.calls]
+    assert lazy.serialise() == data
+    out = BytesIO()
+    assert lazy.serialise_to(out) == len(data)
+    assert out.getvalue() == data
+    assert not any(func.is_loaded for func in Bytecode.from_bytes(data, lazy=True).functions if func.nops.value)
+
+
+def test_resolve_fields_cache():
+    code = Bytecode.create_empty()
+    base, child = Obj(), Obj()
+    base.super.value = -1
+    base.fields = [Field(strRef(0), tIndex(0))]
+    child.fields = [Field(strRef(0), tIndex(0))]
+    for obj in (base, child):
+        typ = Type()
+        typ.kind.value = Type.Kind.OBJ.value
+        typ.definition = obj
+        idx = code.add_type(typ)
+        if obj is base:
+            child.super = idx
+
+    fields = child.resolve_fields(code)
+    assert fields == base.fields + child.fields
+    fields.append(Field(strRef(0), tIndex(0)))  # callers own the returned list
+    assert child.resolve_fields(code) == base.fields + child.fields
+
+    base.fields.append(Field(strRef(0), tIndex(0)))
+    code.invalidate_proto_field_cache()
+    assert len(child.resolve_fields(code)) == 3
+
+
+def test_const_str_malformed_constant():
+    code = Bytecode.from_path(test_files[0])
+    strings = {}
+    for gindex in range(len(code.global_types)):
+        try:
+            strings[gindex] = code.const_str(gindex)
+        except (ValueError, TypeError):
+            pass
+    assert strings
+    gindex = next(iter(strings))
+    const = next(c for c in code.constants if c._global.value == gindex)
+    const.fields = []  # a String constant missing its bytes field
+    code.init_globals()
+    with pytest.raises(ValueError):
+        code.const_str(gindex)
+    assert all(code.const_str(g) == v for g, v in strings.items() if g != gindex)
+
+
+def test_strings_block_rewritten_stream():
+    def block(*strings):
+        strs = StringsBlock()
+        strs.value = list(strings)
+        return strs.serialise()
+
+    with tempfile.TemporaryFile() as fp:
+        f = cast(BinaryIO, fp)
+        f.write(block("ab", "c"))
+        f.seek(0)
+        assert StringsBlock().deserialise(f, 2).value == ["ab", "c"]
+        f.seek(0)
+        f.write(block("xy", "z"))
+        f.seek(0)
+        assert StringsBlock().deserialise(f, 2).value == ["xy", "z"]  # re-read, not served from a stale copy
+        assert f.tell() == len(block("xy", "z"))
+
+
+def test_lazy_failed_load(monkeypatch):
+    with open(test_files[0], "rb") as f:
+        data = f.read()
+    code = Bytecode.from_bytes(data, lazy=True)
+    func = next(func for func in code.functions if func.nops.value)
+
+    def malformed(buf, pos, nops):
+        raise InvalidOpCode(f"Unknown opcode at {hex(pos)}")
+
+    monkeypatch.setattr(core, "_decode_ops", malformed)
+    for _ in range(2):  # a failed load must keep raising instead of leaving the function loaded but empty
+        with pytest.raises(InvalidOpCode):
+            func.ops
+        assert not func.is_loaded
+    monkeypatch.undo()
+    assert len(func.ops) == func.nops.value
+    assert code.serialise() == data
+
+
+@pytest.mark.parametrize(
+    "load", [Bytecode.from_bytes, lambda data: Bytecode().deserialise(BytesIO(data))], ids=["from_bytes", "deserialise"]
+)
+def test_search_magic(load):
+    data = Bytecode.create_empty().serialise()
+    # magic straddling a 1 KiB boundary
+    code = load(b"\x00" * 1022 + data)
+    assert code.section_offsets["magic"] == 1022
+    assert code.serialise() == data
+    with pytest.raises(NoMagic):
+        load(b"\x00" * 64)
+
+
+def test_from_bytes_track_sections():
+    data = Bytecode.create_empty().serialise()
+    code = Bytecode.from_bytes(data, track_sections=True, workers=1)
+    assert code.tracked_sections and "type 0" in code.section_offsets
+
+
+def test_deserialise_stream_offsets():
+    data = Bytecode.create_empty().serialise()
+    with tempfile.TemporaryFile() as fp:
+        f = cast(BinaryIO, fp)
+        f.write(b"\x00" * 4 + data + b"trailer")
+        f.seek(4)
+        code = Bytecode().deserialise(f, search_magic=False, track_sections=True)
+        assert code.section_offsets["magic"] == 4
+        assert code.section_at(code.section_offsets["type 1"]) == "type 1"
+        assert f.tell() == 4 + len(data)
+
+
+def test_track_sections():
+    data = Bytecode.create_empty().serialise()
+    coarse = Bytecode().deserialise(BytesIO(data))
+    assert "types" in coarse.section_offsets
+    assert "type 0" not in coarse.section_offsets
+    detailed = Bytecode().deserialise(BytesIO(data), track_sections=True)
+    assert not coarse.tracked_sections and detailed.tracked_sections
+    assert detailed.section_offsets["type 0"] == detailed.section_offsets["types"]
+    assert detailed.section_at(detailed.section_offsets["type 1"]) == "type 1"
+    detailed.section_offsets["type 1"] = detailed.section_offsets["type 0"]  # same number of sections
+    assert detailed.section_at(detailed.section_offsets["type 0"]) == "type 1"
+
+
+def test_track_sections_env(monkeypatch):
+    data = Bytecode.create_empty().serialise()
+    monkeypatch.setenv("CRASHLINK_TRACK_SECTIONS", "1")
+    assert "type 0" in Bytecode().deserialise(BytesIO(data)).section_offsets
+    assert "type 0" not in Bytecode().deserialise(BytesIO(data), track_sections=False).section_offsets
+
+
+@pytest.mark.parametrize("path", test_files)
+def test_parallel_functions(path: str):
+    with open(path, "rb") as f:
+        data = f.read()
+    eager = Bytecode.from_bytes(data)
+    with open(path, "rb") as f:
+        parallel = Bytecode().deserialise(f, workers=4)
+    assert parallel.is_ok()
+    assert all(func.is_loaded for func in parallel.functions)
+    for a, b in zip(eager.functions, parallel.functions):
+        assert [str(op) for op in a.ops] == [str(op) for op in b.ops]
+        assert [c.value for c in a.calls] == [c.value for c in b.calls]
+    assert parallel.serialise() == data
+    assert eager.serialise(workers=4) == data
+    out = BytesIO()
+    assert eager.serialise_to(out, workers=4) == len(data)
+    assert out.getvalue() == data
+
+
+def test_strings_block_reuses_raw():
+    block = StringsBlock()
+    block.value = ["hello", "wörld", ""]
+    data = block.serialise()
+    loaded = StringsBlock().deserialise(BytesIO(data), 3)
+    assert loaded.serialise() == data
+    loaded.find_or_add("new")
+    block.value.append("new")
+    assert loaded.serialise() == block.serialise()
+    loaded.value[0] = "changed"
+    assert StringsBlock().deserialise(BytesIO(loaded.serialise()), 4).value[0] == "changed"
+
+
+def test_default_workers(monkeypatch):
+    with open(test_files[0], "rb") as f:
+        data = f.read()
+    pools = []
+
+    class Recording(ThreadPoolExecutor):
+        def __init__(self, max_workers=None, *args, **kwargs):
+            pools.append(max_workers)
+            super().__init__(max_workers, *args, **kwargs)
+
+    monkeypatch.setattr(core, "ThreadPoolExecutor", Recording)
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: False, raising=False)  # free-threaded build
+    code = Bytecode.from_bytes(data)
+    assert all(func.is_loaded for func in code.functions)
+    cpus = os.cpu_count() or 1
+    assert pools == ([cpus] if cpus > 1 else [])
+    pools.clear()
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: True, raising=False)
+    Bytecode.from_bytes(data)
+    assert pools == []
@@ -1,6 +1,16 @@
 from io import BytesIO
 
-from crashlink import VarInt
+import pytest
+
+from crashlink import Regs, SerialisableInt, VarInt, VarInts
+
+
+class NonSeekable(BytesIO):
+    def seekable(self) -> bool:
+        return False
+
+    def seek(self, *args, **kwargs) -> int:
+        raise OSError("stream is not seekable")
 
 
 def test_range():
@@ -21,3 +31,39 @@ def test_negatives():
         print(f"Decoded value: {decoded.value}")
 
         assert value == decoded.value
+
+
+def test_serialise_into():
+    buf = bytearray(b"\xff")
+    expected = b"\xff"
+    for value in [0, 1, 127, 128, -1, -127, 0x1FFF, -0x2000, 0x123456]:
+        VarInt(value).serialise_into(buf)
+        expected += VarInt(value).serialise()
+    assert bytes(buf) == expected
+
+
+def test_varint_lists():
+    for cls in (Regs, VarInts):
+        for values in ([], [0, 5, 127], [1, 200, -3, 0x12345]):
+            encoded = VarInt(len(values)).serialise() + b"".join(VarInt(v).serialise() for v in values)
+            f = BytesIO(encoded + b"\x7f")
+            decoded = cls().deserialise(f)
+            assert [v.value for v in decoded.value] == values
+            assert f.read() == b"\x7f"
+            assert decoded.serialise() == encoded
+            f = NonSeekable(encoded + b"\x7f")  # multi-byte runs don't seek back or read past their end
+            assert [v.value for v in cls().deserialise(f).value] == values
+            assert f.read() == b"\x7f"
+        with pytest.raises(ValueError):
+            cls().deserialise(BytesIO(b"\x02\x01\x81"))  # second VarInt cut short
+
+
+def test_varint_non_seekable_stream():
+    for value in (0, 0x7F, -0x1FFF, 0x2000, -0x12345, 0x1FFFFFFF):
+        assert VarInt().deserialise(NonSeekable(VarInt(value).serialise())).value == value
+
+
+def test_serialisable_int_high_zero_bytes():
+    assert SerialisableInt().deserialise(BytesIO(b"\x80\x00"), length=2, signed=True).value == 128
+    assert SerialisableInt().deserialise(BytesIO(b"\x01\x00"), length=2, byteorder="big").value == 256
+    assert SerialisableInt().deserialise(BytesIO(b"\x00\x00\x00\x00")).value == 0